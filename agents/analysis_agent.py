@@ -1,5 +1,7 @@
 import json
 from core.gemini_client import GeminiClient
+from core.checkpoint import RunCheckpoint
+from core.indicators import IndicatorEngine
 
 class AnalysisAgent:
     """
@@ -7,25 +9,44 @@ class AnalysisAgent:
     This agent combines the logic for profiling, problem analysis, and
     generating insights for shopkeepers and customers.
     """
-    def __init__(self, gemini_client: GeminiClient):
+    def __init__(self, gemini_client: GeminiClient, indicator_engine: IndicatorEngine = None,
+                 priority: str = "normal"):
         self.gemini_client = gemini_client
+        self.indicator_engine = indicator_engine or IndicatorEngine()
+        self.priority = priority
 
-    def analyze(self, village_data: dict) -> dict:
+    def analyze(self, village_data: dict, peer_villages: list = None, checkpoint: RunCheckpoint = None,
+                tenant: str = None) -> dict:
         """
         Runs all analyses and returns a dictionary with the results.
 
         Args:
             village_data: A dictionary containing the structured data about the village.
+            peer_villages: Optional structured data of other villages in the same district
+                or state, used to rank the village's indicators.
+            checkpoint: Optional run checkpoint. Each completed analysis is saved to it,
+                so a resumed run only repeats the analyses that failed. The first failed
+                analysis raises StageFailed and the remaining ones are not run.
+            tenant: The scheduler fair-share key for this village's model calls. Defaults to
+                the village's peer group (state or district) in the indicator engine.
 
         Returns:
             A dictionary containing all the analysis reports.
         """
         print("\nAnalysis Agent: Shuru ho raha hai... (Starting analysis...)")
         
-        village_profile = self._generate_village_profile(village_data)
-        problem_analysis = self._analyze_problems(village_data)
-        shopkeeper_insights = self._generate_shopkeeper_insights(village_data)
-        customer_recommendations = self._generate_customer_recommendations(village_data)
+        key_indicators = self._compute_key_indicators(village_data, peer_villages or [])
+        tenant = tenant or self.indicator_engine.peer_group(village_data)
+
+        def run(stage, func):
+            if checkpoint is None:
+                return func(village_data, key_indicators, tenant)
+            return checkpoint.run_stage(f"analysis_{stage}", func, village_data, key_indicators, tenant)
+
+        village_profile = run("village_profile", self._generate_village_profile)
+        problem_analysis = run("problem_analysis", self._analyze_problems)
+        shopkeeper_insights = run("shopkeeper_insights", self._generate_shopkeeper_insights)
+        customer_recommendations = run("customer_recommendations", self._generate_customer_recommendations)
 
         print("Analysis Agent: Sabhi analysis poore ho gaye. (All analyses completed.)")
 
@@ -34,9 +55,16 @@ class AnalysisAgent:
             "problem_analysis": problem_analysis,
             "shopkeeper_insights": shopkeeper_insights,
             "customer_recommendations": customer_recommendations,
+            "key_indicators": key_indicators,
         }
 
-    def _generate_village_profile(self, village_data: dict) -> str:
+    def _compute_key_indicators(self, village_data: dict, peer_villages: list) -> str:
+        """Computes the village's quantitative indicators locally, without a model call."""
+        print(" -> Gaon ke mukhya aankde nikaale ja rahe hain... (Computing key indicators...)")
+        indicators = self.indicator_engine.compute([village_data] + list(peer_villages))
+        return self.indicator_engine.facts(indicators, 0)
+
+    def _generate_village_profile(self, village_data: dict, key_indicators: str, tenant: str) -> str:
         """Generates a narrative village profile."""
         print(" -> Village profile banaya ja raha hai... (Generating village profile...)")
         prompt = f"""
@@ -47,11 +75,14 @@ class AnalysisAgent:
         Village Data:
         {json.dumps(village_data, indent=2)}
 
+        Key Indicators (computed from the data, use these exact figures):
+        {key_indicators}
+
         Generate the profile text.
         """
-        return self.gemini_client.generate_text(prompt)
+        return self.gemini_client.generate_text(prompt, priority=self.priority, tenant=tenant)
 
-    def _analyze_problems(self, village_data: dict) -> str:
+    def _analyze_problems(self, village_data: dict, key_indicators: str, tenant: str) -> str:
         """Analyzes the top 3 problems."""
         print(" -> Top 3 samasyaon ka vishleshan kiya ja raha hai... (Analyzing top 3 problems...)")
         # Ensure 'top_3_problems' key exists
@@ -68,11 +99,14 @@ class AnalysisAgent:
         Village Data:
         {json.dumps(village_data, indent=2)}
 
+        Key Indicators (computed from the data, use these exact figures):
+        {key_indicators}
+
         Provide a detailed analysis for each of the top three problems.
         """
-        return self.gemini_client.generate_text(prompt)
+        return self.gemini_client.generate_text(prompt, priority=self.priority, tenant=tenant)
 
-    def _generate_shopkeeper_insights(self, village_data: dict) -> str:
+    def _generate_shopkeeper_insights(self, village_data: dict, key_indicators: str, tenant: str) -> str:
         """Generates insights for local shopkeepers."""
         print(" -> Dukandaron ke liye insights taiyaar ki ja rahi hain... (Generating insights for shopkeepers...)")
         prompt = f"""
@@ -86,11 +120,14 @@ class AnalysisAgent:
         Village Data:
         {json.dumps(village_data, indent=2)}
 
+        Key Indicators (computed from the data, use these exact figures):
+        {key_indicators}
+
         Provide a concise report with these insights for the village shopkeepers.
         """
-        return self.gemini_client.generate_text(prompt)
+        return self.gemini_client.generate_text(prompt, priority=self.priority, tenant=tenant)
 
-    def _generate_customer_recommendations(self, village_data: dict) -> str:
+    def _generate_customer_recommendations(self, village_data: dict, key_indicators: str, tenant: str) -> str:
         """Generates recommendations for villagers."""
         print(" -> Grahakon ke liye sujhav taiyaar kiye ja rahe hain... (Generating recommendations for customers...)")
         prompt = f"""
@@ -101,9 +138,12 @@ class AnalysisAgent:
         Village Data:
         {json.dumps(village_data, indent=2)}
 
+        Key Indicators (computed from the data, use these exact figures):
+        {key_indicators}
+
         Provide a list of 3-5 key recommendations for the villagers.
         """
-        return self.gemini_client.generate_text(prompt)
+        return self.gemini_client.generate_text(prompt, priority=self.priority, tenant=tenant)
 
 if __name__ == '__main__':
     try:
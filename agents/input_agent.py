@@ -62,7 +62,8 @@ class InputAgent:
         current_answers = answers.copy()
         
         while True:
-            response = self.gemini_client.generate_text(prompt)
+            # The user is waiting at the prompt, so this call must not queue behind batch work.
+            response = self.gemini_client.generate_text(prompt, priority="interactive", tenant="input")
             response = response.strip()
 
             if response.startswith("```json"):
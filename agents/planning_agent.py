@@ -5,16 +5,20 @@ class PlanningAgent:
     """
     Generates a long-term growth plan for the village.
     """
-    def __init__(self, gemini_client: GeminiClient):
+    def __init__(self, gemini_client: GeminiClient, priority: str = "normal"):
         self.gemini_client = gemini_client
+        self.priority = priority
 
-    def create_growth_plan(self, village_data: dict, analysis_results: dict) -> str:
+    def create_growth_plan(self, village_data: dict, analysis_results: dict, tenant: str) -> str:
         """
         Creates a 3, 6, and 12-month growth plan.
 
         Args:
             village_data: The initial structured data of the village.
             analysis_results: The analyses generated by the AnalysisAgent.
+            tenant: The scheduler fair-share key. Pass the same one used for the analyses,
+                such as IndicatorEngine.peer_group(village_data), so a village's model calls
+                share one queue.
 
         Returns:
             A string containing the complete growth plan.
@@ -48,7 +52,7 @@ class PlanningAgent:
         Format the output clearly, with distinct sections for each phase. The tone should be professional, encouraging, and practical.
         """
         
-        plan = self.gemini_client.generate_text(prompt)
+        plan = self.gemini_client.generate_text(prompt, priority=self.priority, tenant=tenant)
         print("Planning Agent: Growth plan taiyaar hai. (Growth plan is ready.)")
         return plan
 
@@ -76,7 +80,8 @@ if __name__ == '__main__':
         gemini_client = GeminiClient()
         planning_agent = PlanningAgent(gemini_client)
         
-        growth_plan = planning_agent.create_growth_plan(dummy_village_data, dummy_analysis_results)
+        growth_plan = planning_agent.create_growth_plan(dummy_village_data, dummy_analysis_results,
+                                                   tenant="uttar pradesh")
         
         print("\n\n--- Generated Growth Plan ---")
         print(growth_plan)
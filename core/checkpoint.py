@@ -0,0 +1,152 @@
+import json
+import os
+import tempfile
+import uuid
+from datetime import datetime
+
+class StageFailed(Exception):
+    """Raised when a stage's output is flagged as a failure, so later stages do not build on it."""
+    def __init__(self, stage: str):
+        super().__init__(f"Stage '{stage}' failed.")
+        self.stage = stage
+
+
+class RunCheckpoint:
+    """
+    Durably stores the output of each completed pipeline stage in a run directory,
+    so a failed run can be resumed without repeating paid model calls.
+    """
+    def __init__(self, run_id: str = None, base_dir: str = "runs", is_failure=None):
+        """
+        Opens a new or existing run. The run directory is only created when the
+        first stage is saved, so runs that fail before any stage leave nothing behind.
+
+        Args:
+            run_id: The ID of the run to resume. A new ID is generated if not given.
+            base_dir: The directory that holds all run directories.
+            is_failure: Optional predicate on a text value. Stage outputs containing any
+                text it flags, such as a failed model call, are not saved.
+
+        Raises:
+            ValueError: If the run ID is not a plain directory name.
+            FileNotFoundError: If a run ID is given but no such run exists.
+        """
+        if run_id is not None and (not run_id or run_id == "." or ".." in run_id
+                                   or "/" in run_id or "\\" in run_id):
+            raise ValueError(f"Invalid run ID '{run_id}'.")
+        self.is_resumed = run_id is not None
+        self.run_id = run_id or f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        self.run_dir = os.path.join(base_dir, self.run_id)
+        self.is_failure = is_failure or (lambda text: False)
+
+        if self.is_resumed and not os.path.isdir(self.run_dir):
+            raise FileNotFoundError(f"No saved run found with ID '{self.run_id}' in '{base_dir}'.")
+
+    def has_saved_stages(self) -> bool:
+        """Checks whether this run has saved anything that a resume could reuse."""
+        return os.path.isdir(self.run_dir) and any(name.endswith(".json") for name in os.listdir(self.run_dir))
+
+    def has(self, stage: str) -> bool:
+        """Checks whether a stage has already been completed in this run."""
+        return os.path.exists(self._stage_path(stage))
+
+    def load(self, stage: str):
+        """Loads the saved output of a completed stage."""
+        with open(self._stage_path(stage), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save(self, stage: str, output):
+        """
+        Saves a stage's output atomically. The file is written to a temporary path
+        and renamed into place, so a crash never leaves a half-written checkpoint.
+        """
+        os.makedirs(self.run_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.run_dir, prefix=f".{stage}-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(output, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self._stage_path(stage))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def run_stage(self, stage: str, func, *args, **kwargs):
+        """
+        Returns the saved output of a stage if it was already completed, otherwise runs
+        it and saves the output. Empty outputs are returned without being saved.
+
+        Raises:
+            StageFailed: If the output contains text flagged by is_failure. It is not
+                saved, so a resumed run retries the stage.
+        """
+        if self.has(stage):
+            print(f" -> '{stage}' pehle se poora hai, checkpoint se load kiya gaya. (Loaded '{stage}' from checkpoint.)")
+            return self.load(stage)
+
+        output = func(*args, **kwargs)
+        if self._contains_failure(output):
+            raise StageFailed(stage)
+        if output:
+            self.save(stage, output)
+        return output
+
+    def _stage_path(self, stage: str) -> str:
+        return os.path.join(self.run_dir, f"{stage}.json")
+
+    def _contains_failure(self, output) -> bool:
+        """Checks whether any text in a stage's output is flagged by is_failure."""
+        if isinstance(output, str):
+            return self.is_failure(output)
+        if isinstance(output, dict):
+            return any(self._contains_failure(value) for value in output.values())
+        if isinstance(output, list):
+            return any(self._contains_failure(value) for value in output)
+        return False
+
+
+if __name__ == '__main__':
+    # This is for testing the RunCheckpoint directly. No API key is needed.
+    import shutil
+
+    print("--- Running RunCheckpoint Test ---")
+    test_dir = tempfile.mkdtemp()
+    calls = []
+
+    def expensive_stage():
+        calls.append("analysis")
+        return {"village_profile": "Basi is a village in Uttar Pradesh..."}
+
+    def failing_stage():
+        calls.append("plan")
+        return "Error: model unavailable"
+
+    checkpoint = RunCheckpoint(base_dir=test_dir, is_failure=lambda text: text.startswith("Error:"))
+    assert not os.path.exists(checkpoint.run_dir), "The run directory must be created lazily."
+    checkpoint.run_stage("analysis_results", expensive_stage)
+    try:
+        checkpoint.run_stage("growth_plan", failing_stage)
+    except StageFailed as e:
+        assert e.stage == "growth_plan"
+    else:
+        raise AssertionError("A failed stage output must raise StageFailed.")
+    assert not checkpoint.has("growth_plan"), "A failed stage output must not be checkpointed."
+    print(f"Saved run '{checkpoint.run_id}' after {len(calls)} call(s).")
+
+    calls.clear()
+    resumed = RunCheckpoint(checkpoint.run_id, base_dir=test_dir)
+    result = resumed.run_stage("analysis_results", expensive_stage)
+    assert calls == [], "A resumed run must not repeat a completed stage."
+    print(f"Resumed run made {len(calls)} new call(s) and loaded: {result}")
+
+    for bad_id in ["../etc", "a/b", "..", ""]:
+        try:
+            RunCheckpoint(bad_id, base_dir=test_dir)
+        except ValueError:
+            continue
+        raise AssertionError(f"Run ID {bad_id!r} should have been rejected.")
+    print("Invalid run IDs are rejected.")
+
+    shutil.rmtree(test_dir)
@@ -1,17 +1,26 @@
 import os
 import google.generativeai as genai
 from dotenv import load_dotenv
+from core.scheduler import RequestScheduler
+
+# Every failed generation returns text starting with this prefix instead of raising.
+GENERATION_ERROR_PREFIX = "Error: Could not generate response from Gemini."
+
+def is_generation_error(text: str) -> bool:
+    """Checks whether a generated text is actually a failed-generation error message."""
+    return text.startswith(GENERATION_ERROR_PREFIX)
 
 class GeminiClient:
     """
     A client to interact with the Google Gemini API.
     """
-    def __init__(self, model_name="gemini-2.5-flash-lite"):
+    def __init__(self, model_name="gemini-2.5-flash-lite", scheduler: RequestScheduler = None):
         """
         Initializes the Gemini client.
         - Loads environment variables from a .env file.
         - Configures the Gemini API with the provided API key.
         - Initializes the specified generative model.
+        - Routes all calls through a RequestScheduler, which can be shared between clients.
         """
         load_dotenv()
         self.api_key = os.getenv("GEMINI_API_KEY")
@@ -20,14 +29,19 @@ class GeminiClient:
         
         genai.configure(api_key=self.api_key)
         self.model = genai.GenerativeModel(model_name)
+        self.scheduler = scheduler or RequestScheduler()
         print("Gemini Client initialized successfully.")
 
-    def generate_text(self, prompt: str) -> str:
+    def generate_text(self, prompt: str, priority: str = "normal", tenant: str = "default",
+                      deadline: float = None) -> str:
         """
         Generates text using the configured Gemini model.
 
         Args:
             prompt: The text prompt to send to the model.
+            priority: The scheduler class, one of "interactive", "normal" or "bulk".
+            tenant: The fair-share key for the scheduler, e.g. a district or state name.
+            deadline: Optional seconds from now by which the call must be dispatched.
 
         Returns:
             The generated text as a string.
@@ -36,11 +50,12 @@ class GeminiClient:
             Exception: If the text generation fails.
         """
         try:
-            response = self.model.generate_content(prompt)
+            response = self.scheduler.call(self.model.generate_content, prompt, priority=priority,
+                                           tenant=tenant, deadline=deadline)
             return response.text
         except Exception as e:
             print(f"An error occurred during text generation: {e}")
-            return f"Error: Could not generate response from Gemini. Details: {e}"
+            return f"{GENERATION_ERROR_PREFIX} Details: {e}"
 
 if __name__ == '__main__':
     try:
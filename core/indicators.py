@@ -0,0 +1,537 @@
+import re
+import numpy as np
+
+# Internet availability is scored on a 0-4 tier scale.
+INTERNET_TIERS = [
+    (4, ("5g", "high-speed", "high speed", "broadband", "fiber", "fibre", "wifi", "wi-fi")),
+    (3, ("4g", "lte")),
+    (2, ("3g",)),
+    (1, ("2g", "edge", "gprs")),
+    (0, ("none", "nahi", "no internet", "not available")),
+]
+
+# Keywords used to tag free-text problems with a category. They match whole words,
+# optionally plural, so "broadband" is not a road and "road network" is not internet.
+PROBLEM_CATEGORIES = {
+    "water": ("water", "paani", "pani", "drinking", "irrigation", "drought"),
+    "electricity": ("electricity", "power", "bijli", "light", "voltage"),
+    "roads": ("road", "sadak", "transport", "bus service"),
+    "health": ("health", "hospital", "clinic", "doctor", "medical", "disease"),
+    "education": ("school", "education", "teacher", "padhai", "literacy"),
+    "employment": ("job", "employment", "unemployment", "rozgar", "income", "migration"),
+    "sanitation": ("sanitation", "toilet", "drainage", "garbage", "waste", "safai"),
+    "internet": ("internet", "mobile network", "phone network", "signal", "digital", "broadband", "wifi"),
+    "agriculture": ("crop", "farming", "kheti", "fertilizer", "seed", "mandi"),
+}
+
+INTERNET_PATTERN = re.compile(
+    "|".join(f"(?P<tier{tier}>\\b(?:{'|'.join(map(re.escape, keywords))})\\b)" for tier, keywords in INTERNET_TIERS)
+)
+# A tier is negated by "no 4G" / "without wifi" before it, or "wifi nahi hai" / "4G not available" after it.
+NEGATION_BEFORE = re.compile(r"\b(?:no|not|without|bina)\s+(?:\w+\s+)?$")
+NEGATION_AFTER = re.compile(r"\s*(?:nahi|nahin|nhi|not|na)\b")
+PROBLEM_PATTERN = re.compile(
+    r"\b(?:"
+    + "|".join(f"(?P<{category}>{'|'.join(map(re.escape, keywords))})" for category, keywords in PROBLEM_CATEGORIES.items())
+    + r")s?\b"
+)
+# A population figure, optionally a range ("3-4 hazar", "3 to 4 thousand"), with an optional unit
+# and an optional word saying it counts people. The unit must be a whole word, so Hinglish like
+# "3000 ke aas paas" is not read as 3000k.
+POPULATION_UNITS = r"k|thousand|hazar|hajar|lakh|lac"
+POPULATION_NUMBER = r"\d+(?:,\d{2,3})*(?:\.\d+)?(?![\d,])"
+POPULATION_PATTERN = re.compile(
+    rf"(?P<low>{POPULATION_NUMBER})(?:\s*(?P<low_unit>{POPULATION_UNITS})\b)?"
+    rf"(?:\s*(?:-|to|se)\s*(?P<high>{POPULATION_NUMBER}))?"
+    rf"(?:\s*(?P<unit>{POPULATION_UNITS})\b)?"
+    r"(?P<people>\s*(?:log|logon|people|persons?|population|residents|villagers|abaadi|jansankhya)\b)?",
+    re.IGNORECASE,
+)
+FACILITY_WORDS = {
+    "shop": r"shops?|dukan\w*|stores?",
+    "school": r"schools?",
+    "clinic": r"hospitals?|clinics?|phcs?|dispensar\w*",
+}
+FACILITY_NAMES = "|".join(f"(?P<{slot}>{words})" for slot, words in FACILITY_WORDS.items())
+# A count never swallows a trailing comma: "10," is 10, while "1,000" and "1,00,000" stay whole.
+FACILITY_COUNT = r"(?P<count>\d+(?:,\d{2,3})*(?!\d))"
+# Up to two descriptive words may sit between a count and its facility, as in "2 primary schools".
+FACILITY_FILLER = rf"(?:(?!(?:{'|'.join(FACILITY_WORDS.values())})\b)[a-z]+\s+){{0,2}}"
+# "10 shops" / "1 government hospital".
+FACILITY_PATTERN = re.compile(rf"{FACILITY_COUNT}\s*{FACILITY_FILLER}(?:{FACILITY_NAMES})\b", re.IGNORECASE)
+# "shops: 10" / "hospital = 1".
+FACILITY_LABELLED_PATTERN = re.compile(rf"\b(?:{FACILITY_NAMES})\s*[:=\-]\s*{FACILITY_COUNT}", re.IGNORECASE)
+# An explicit zero, such as "no hospital" / "koi nahi school", or "hospital nahi hai" / "clinic koi nahi".
+FACILITY_NONE_PATTERN = re.compile(rf"\b(?:no|zero|koi nahi)\s+{FACILITY_FILLER}(?:{FACILITY_NAMES})\b", re.IGNORECASE)
+FACILITY_ABSENT_PATTERN = re.compile(rf"\b(?:{FACILITY_NAMES})\s+(?:koi\s+)?(?:nahi|nahin|nhi)\b", re.IGNORECASE)
+FACILITY_SLOTS = {"shop": 0, "school": 1, "clinic": 2}
+UNIT_MULTIPLIERS = {"k": 1_000, "thousand": 1_000, "hazar": 1_000, "lakh": 100_000, "lac": 100_000}
+
+# Metrics that get a percentile rank against their peer group.
+RANKED_METRICS = ["population", "people_per_shop", "people_per_school", "people_per_clinic", "internet_tier"]
+# What a higher percentile means for each ranked metric, so prompts cannot read a rank backwards.
+RANK_DIRECTIONS = {
+    "population": "higher = larger village",
+    "people_per_shop": "higher = fewer shops per person",
+    "people_per_school": "higher = fewer schools per person",
+    "people_per_clinic": "higher = fewer clinics per person",
+    "internet_tier": "higher = better internet",
+}
+
+
+class IndicatorEngine:
+    """
+    Computes quantitative village indicators locally with NumPy, without any model calls.
+    Indicators are computed in bulk for a whole batch of villages. Parsing the free-text
+    answers is plain Python and scales with the number of distinct answers; rank() is
+    fully vectorized and re-ranks 100,000 villages in well under a second.
+    """
+    def __init__(self, group_by: str = "state"):
+        """
+        Initializes the indicator engine.
+
+        Args:
+            group_by: Peer group used for percentile ranks, either "state" or "district".
+        """
+        if group_by not in ("state", "district"):
+            raise ValueError(f"group_by must be 'state' or 'district', got '{group_by}'.")
+        self.group_by = group_by
+        self.categories = list(PROBLEM_CATEGORIES)
+
+    def compute(self, villages: list) -> dict:
+        """
+        Computes indicators and peer percentile ranks for a batch of villages.
+
+        Args:
+            villages: A list of structured village data dictionaries.
+
+        Returns:
+            A dictionary of NumPy arrays, one entry per village in each array.
+            Missing values are NaN; per-facility ratios are infinite when the village
+            has none of that facility. Percentile ranks are stored under "<metric>_pct".
+        """
+        # Short answers repeat heavily across a batch, so each distinct answer is parsed once.
+        population_cache, facility_cache, tier_cache = {}, {}, {}
+        population = np.array(
+            [self._cached(population_cache, self._parse_population, v.get("population_approx")) for v in villages],
+            dtype=float,
+        )
+        facilities = np.array(
+            [self._cached(facility_cache, self._parse_facilities, v.get("shops_schools_hospitals")) for v in villages],
+            dtype=float,
+        ).reshape(len(villages), 3)
+        internet_tier = np.array(
+            [self._cached(tier_cache, self._score_internet, v.get("internet_availability")) for v in villages],
+            dtype=float,
+        )
+        problem_tags = self._tag_problems([v.get("top_3_problems") for v in villages])
+        peer_groups = [self._peer_group_with_kind(v) for v in villages]
+        kinds = np.array([kind for kind, _ in peer_groups], dtype=object)
+        groups = np.array([label for _, label in peer_groups], dtype=object)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            per_facility = population[:, None] / facilities
+        # A village with none of a facility keeps an infinite ratio, which ranks as the worst served.
+        per_facility[np.isnan(population)[:, None] | np.isnan(facilities)] = np.nan
+
+        indicators = {
+            "population": population,
+            "shops": facilities[:, 0],
+            "schools": facilities[:, 1],
+            "clinics": facilities[:, 2],
+            "people_per_shop": per_facility[:, 0],
+            "people_per_school": per_facility[:, 1],
+            "people_per_clinic": per_facility[:, 2],
+            "internet_tier": internet_tier,
+            "problem_tags": problem_tags,
+            "peer_group": groups,
+            "peer_group_kind": kinds,
+        }
+        return self.rank(indicators)
+
+    def rank(self, indicators: dict) -> dict:
+        """
+        Adds peer percentile ranks to already computed indicators. This step is fully
+        vectorized, so dashboards can re-rank a large batch without re-parsing any text.
+
+        Args:
+            indicators: A dictionary of indicator arrays, including "peer_group" and
+                optionally "peer_group_kind".
+
+        Returns:
+            The same dictionary with "peer_group_size", "<metric>_pct" and "<metric>_peers"
+            (villages in the group that have a value for the metric) entries added.
+        """
+        group_codes, group_sizes = self._encode_groups(indicators["peer_group"])
+        if "peer_group_kind" in indicators:
+            # A district and a state with the same name are different peer groups.
+            kind_codes, _ = self._encode_groups(indicators["peer_group_kind"])
+            group_codes, group_sizes = self._encode_groups(kind_codes * len(group_sizes) + group_codes)
+        indicators["peer_group_size"] = group_sizes[group_codes]
+        for metric in RANKED_METRICS:
+            values = indicators[metric]
+            has_value = ~np.isnan(values)
+            peers = np.bincount(group_codes, weights=has_value, minlength=len(group_sizes))[group_codes]
+            indicators[f"{metric}_peers"] = np.where(has_value, peers, np.nan)
+            indicators[f"{metric}_pct"] = self.percentile_rank(values, group_codes)
+        return indicators
+
+    @staticmethod
+    def percentile_rank(values: np.ndarray, group_codes: np.ndarray) -> np.ndarray:
+        """
+        Computes the percentile rank (0-100) of each value within its group.
+        Ties share the midpoint rank. NaN values are excluded and ranked as NaN.
+
+        Args:
+            values: Metric values, one per village.
+            group_codes: Integer group code per village.
+
+        Returns:
+            An array of percentile ranks.
+        """
+        values = np.asarray(values, dtype=float)
+        group_codes = np.asarray(group_codes, dtype=np.int64)
+        result = np.full(values.shape, np.nan)
+        valid = ~np.isnan(values)
+        if not valid.any():
+            return result
+
+        # Turn values into dense integer ranks so (group, rank) packs into one sortable key.
+        _, value_ranks = np.unique(values[valid], return_inverse=True)
+        value_ranks = value_ranks.ravel().astype(np.int64)
+        codes = group_codes[valid]
+        span = int(value_ranks.max()) + 1
+        keys = codes * span + value_ranks
+        sorted_keys = np.sort(keys)
+
+        below = np.searchsorted(sorted_keys, keys, side="left")
+        upto = np.searchsorted(sorted_keys, keys, side="right")
+        group_start = np.searchsorted(sorted_keys, codes * span, side="left")
+        group_end = np.searchsorted(sorted_keys, (codes + 1) * span, side="left")
+
+        ranks = (below - group_start) + 0.5 * (upto - below)
+        counts = group_end - group_start
+        # A lone value in its group has nothing to be ranked against.
+        result[valid] = np.where(counts > 1, 100.0 * ranks / counts, np.nan)
+        return result
+
+    def facts(self, indicators: dict, index: int = 0) -> str:
+        """
+        Formats one village's indicators as compact facts for an LLM prompt.
+
+        Args:
+            indicators: The output of compute().
+            index: The position of the village in the computed batch.
+
+        Returns:
+            A short multi-line string of facts.
+        """
+        kinds = indicators.get("peer_group_kind")
+        kind = kinds[index] if kinds is not None else self.group_by
+        peer_label = f"{kind} '{indicators['peer_group'][index]}'"
+
+        def fact(label, metric, digits=0):
+            value = indicators[metric][index]
+            if np.isnan(value):
+                return f"- {label}: unknown"
+            if np.isinf(value):
+                return f"- {label}: no facility (0 in the village)"
+            line = f"- {label}: {value:,.{digits}f}"
+            pct = indicators.get(f"{metric}_pct")
+            if pct is not None and not np.isnan(pct[index]):
+                peers = int(indicators[f"{metric}_peers"][index])
+                line += (f" (percentile {pct[index]:.0f} among {peers} villages with data in {peer_label}, "
+                         f"{RANK_DIRECTIONS[metric]})")
+            return line
+
+        lines = [
+            fact("Population", "population"),
+            fact("People per shop", "people_per_shop"),
+            fact("People per school", "people_per_school"),
+            fact("People per clinic/hospital", "people_per_clinic"),
+            fact("Internet tier (0=none, 4=high-speed)", "internet_tier"),
+        ]
+        tags = [c for c, tagged in zip(self.categories, indicators["problem_tags"][index]) if tagged]
+        lines.append(f"- Problem categories: {', '.join(tags) if tags else 'unclassified'}")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _cached(cache: dict, func, value):
+        """Calls func once per distinct hashable value."""
+        try:
+            if value not in cache:
+                cache[value] = func(value)
+            return cache[value]
+        except TypeError:
+            return func(value)
+
+    def peer_group(self, village_data: dict) -> str:
+        """Returns the district or state a village is ranked against and scheduled under."""
+        return self._peer_group_with_kind(village_data)[1]
+
+    def _peer_group_with_kind(self, village_data: dict) -> tuple:
+        """Returns ("district" or "state", name), falling back to the state when there is no district."""
+        if self.group_by == "district" and village_data.get("district"):
+            return "district", str(village_data["district"]).strip().lower()
+        if village_data.get("state"):
+            return "state", str(village_data["state"]).strip().lower()
+        name_and_state = str(village_data.get("village_name_and_state", ""))
+        if "," in name_and_state:
+            return "state", name_and_state.rsplit(",", 1)[-1].strip().lower()
+        return "state", "unknown"
+
+    @staticmethod
+    def _encode_groups(groups: np.ndarray) -> tuple:
+        """Maps group labels to integer codes and returns the codes and group sizes."""
+        if len(groups) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        _, codes = np.unique(groups.astype(str), return_inverse=True)
+        codes = codes.ravel().astype(np.int64)
+        return codes, np.bincount(codes)
+
+    @staticmethod
+    def _parse_population(value) -> float:
+        """Parses values like 5000, "Around 5,000 people", "5k" or "3-4 hazar" into a number."""
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+        candidates = []
+        for match in POPULATION_PATTERN.finditer(str(value or "")):
+            unit = (match.group("unit") or "").lower()
+            low_unit = (match.group("low_unit") or unit).lower()
+            figure = float(match.group("low").replace(",", "")) * UNIT_MULTIPLIERS.get(low_unit, 1)
+            if match.group("high"):
+                high = float(match.group("high").replace(",", "")) * UNIT_MULTIPLIERS.get(unit, 1)
+                figure = (figure + high) / 2
+            candidates.append((bool(unit or low_unit or match.group("people")), figure))
+        # A number with a unit or a word like "log"/"people" is the population. Otherwise a lone
+        # number is trusted, but several bare ones ("2011 census 4500") are too ambiguous to guess.
+        marked = [figure for is_marked, figure in candidates if is_marked]
+        if marked:
+            return marked[0]
+        if len(candidates) == 1:
+            return candidates[0][1]
+        return np.nan
+
+    @staticmethod
+    def _parse_facilities(value) -> list:
+        """Parses text like "10 shops, 2 schools, 1 clinic" into (shops, schools, clinics)."""
+        if isinstance(value, dict):
+            text = ", ".join(f"{count} {name}" for name, count in value.items())
+        else:
+            text = str(value or "")
+        counts = [np.nan, np.nan, np.nan]
+
+        def add(match, count):
+            slot = next(FACILITY_SLOTS[name] for name in FACILITY_WORDS if match.group(name))
+            counts[slot] = count if np.isnan(counts[slot]) else counts[slot] + count
+
+        # Facilities that were never mentioned stay unknown; "no hospital" is a known zero.
+        for pattern in (FACILITY_NONE_PATTERN, FACILITY_ABSENT_PATTERN):
+            for match in pattern.finditer(text):
+                add(match, 0.0)
+        # "shops: 10" is read first, so its count is not also taken by "10 schools" that follows it.
+        labelled_counts = set()
+        for match in FACILITY_LABELLED_PATTERN.finditer(text):
+            add(match, float(match.group("count").replace(",", "")))
+            labelled_counts.add(match.start("count"))
+        for match in FACILITY_PATTERN.finditer(text):
+            if match.start("count") not in labelled_counts:
+                add(match, float(match.group("count").replace(",", "")))
+        return counts
+
+    @staticmethod
+    def _score_internet(value) -> float:
+        """
+        Scores internet availability text on the 0-4 tier scale, taking the best tier that
+        is not negated. "No 4G, only 2G" scores 1; "wifi nahi hai" alone is unknown.
+        """
+        text = str(value or "").lower()
+        available, says_none, negation_end = [], False, 0
+        for match in INTERNET_PATTERN.finditer(text):
+            tier = int(match.lastgroup[4:])
+            if tier == 0:
+                # "nahi" that negates a tier mentioned just before it is not an answer of its own.
+                says_none = says_none or match.start() >= negation_end
+                continue
+            negated_after = NEGATION_AFTER.match(text, match.end())
+            if negated_after:
+                negation_end = negated_after.end()
+            elif not NEGATION_BEFORE.search(text[max(0, match.start() - 20):match.start()]):
+                available.append(tier)
+        if available:
+            return float(max(available))
+        return 0.0 if says_none else np.nan
+
+    def _tag_problems(self, problems: list) -> np.ndarray:
+        """Tags each village's problem text with every matching category, as an (n, categories) boolean matrix."""
+        # Each distinct text is tagged once, then the rows are broadcast back to every village.
+        unique_index = {}
+        inverse = np.fromiter(
+            (unique_index.setdefault(" ".join(map(str, p)) if isinstance(p, (list, tuple)) else str(p or ""),
+                                     len(unique_index)) for p in problems),
+            dtype=np.int64, count=len(problems),
+        )
+        texts = list(unique_index)
+        # Scan all texts joined into one string in a single pass, then map match positions back to texts.
+        blob = "\n".join(texts).lower()
+        lengths = np.fromiter((len(text) + 1 for text in texts), dtype=np.int64, count=len(texts))
+        starts = np.cumsum(lengths) - lengths
+        columns = {category: column for column, category in enumerate(self.categories)}
+        matches = [(m.start(), columns[m.lastgroup]) for m in PROBLEM_PATTERN.finditer(blob)]
+        tags = np.zeros((len(texts), len(self.categories)), dtype=bool)
+        if matches:
+            positions, matched_columns = np.array(matches, dtype=np.int64).T
+            tags[np.searchsorted(starts, positions, side="right") - 1, matched_columns] = True
+        return tags[inverse]
+
+if __name__ == '__main__':
+    # This is for testing the IndicatorEngine directly. No API key is needed.
+    import time
+
+    dummy_villages = [
+        {
+            "village_name_and_state": "Basi, Uttar Pradesh",
+            "population_approx": 5000,
+            "internet_availability": "3G/4G",
+            "shops_schools_hospitals": "10 shops, 2 schools, 1 clinic",
+            "top_3_problems": "1. Lack of clean drinking water, 2. Irregular electricity, 3. Poor road connectivity"
+        },
+        {
+            "village_name_and_state": "Rampur, Uttar Pradesh",
+            "population_approx": "Around 3,200 people",
+            "internet_availability": "2G",
+            "shops_schools_hospitals": "4 shops, 1 school",
+            "top_3_problems": ["No hospital nearby", "Unemployment", "Drainage"]
+        },
+        {
+            "village_name_and_state": "Khedi, Madhya Pradesh",
+            "population_approx": "2k",
+            "internet_availability": "nahi hai",
+            "shops_schools_hospitals": "3 dukanein, 1 school, 1 PHC",
+            "top_3_problems": "Paani ki kami, kheti ke liye seed mehenge"
+        },
+    ]
+
+    print("--- Running IndicatorEngine Test ---")
+    engine = IndicatorEngine()
+
+    # Population answers as InputAgent users actually phrase them, in Hinglish and English.
+    population_answers = {
+        "lagbhag 3000 ke aas paas": 3_000,
+        "3000 karib": 3_000,
+        "5000 kisan parivar": 5_000,
+        "Around 5,000 people": 5_000,
+        "2k": 2_000,
+        "2.5 hazar log": 2_500,
+        "1 lakh": 100_000,
+        "15 thousand": 15_000,
+        "pata nahi": None,
+        "3-4 hazar": 3_500,
+        "around 3 to 4 thousand": 3_500,
+        "3000-4000 log": 3_500,
+        "1,20,000 people": 120_000,
+        "Population 2011 census 4500": None,
+        "2011 census ke hisaab se 4500 log": 4_500,
+    }
+    for answer, expected in population_answers.items():
+        parsed = engine._parse_population(answer)
+        if expected is None:
+            assert np.isnan(parsed), f"{answer!r} should be unknown, got {parsed}"
+        else:
+            assert parsed == expected, f"{answer!r} should parse to {expected}, got {parsed}"
+    print(f"Parsed {len(population_answers)} population answers correctly.")
+
+    internet_answers = {
+        "3G/4G": 3,
+        "nahi hai": 0,
+        "No internet": 0,
+        "wifi nahi hai": None,
+        "No 4G, only 2G": 1,
+        "4G nahi, 2G chalta hai": 1,
+        "4G not available, 3G works": 2,
+        "broadband": 4,
+        "knowledge centre": None,
+    }
+    for answer, expected in internet_answers.items():
+        scored = engine._score_internet(answer)
+        if expected is None:
+            assert np.isnan(scored), f"{answer!r} should be unknown, got {scored}"
+        else:
+            assert scored == expected, f"{answer!r} should score {expected}, got {scored}"
+    print(f"Scored {len(internet_answers)} internet answers correctly.")
+
+    problem_answers = [
+        ("poor broadband", {"internet"}),
+        ("road network bad", {"roads"}),
+        ("highlights: flights delayed, powerful seedling demand", set()),
+        ("No hospitals, bad roads, bijli nahi", {"health", "roads", "electricity"}),
+        (["Paani ki kami", "Unemployment"], {"water", "employment"}),
+    ]
+    tags = engine._tag_problems([answer for answer, _ in problem_answers])
+    for (answer, expected), row in zip(problem_answers, tags):
+        found = {category for category, tagged in zip(engine.categories, row) if tagged}
+        assert found == expected, f"{answer!r} should be tagged {expected}, got {found}"
+    print(f"Tagged {len(problem_answers)} problem answers correctly.")
+
+    facility_answers = {
+        "10 shops, 2 schools, 1 clinic": [10, 2, 1],
+        "10 shops, 2 schools, no hospital": [10, 2, 0],
+        "5 dukanein, koi nahi school, 1 PHC": [5, 0, 1],
+        "3 shops, hospital nahi hai": [3, None, 0],
+        "4 shops, 1 school": [4, 1, None],
+        "shops: 10, schools: 2, hospital: 1": [10, 2, 1],
+        "shops: 10 schools: 2 hospital: 1": [10, 2, 1],
+        "2 primary schools, 1 government hospital, 20 small shops": [20, 2, 1],
+        "1,200 shops, 3 schools": [1200, 3, None],
+        "no government hospital, 12 kirana dukanein": [12, None, 0],
+    }
+    for answer, expected in facility_answers.items():
+        parsed = engine._parse_facilities(answer)
+        for value, want in zip(parsed, expected):
+            assert (np.isnan(value) if want is None else value == want), f"{answer!r} should parse to {expected}, got {parsed}"
+    no_clinic = engine.compute([{"population_approx": 5000, "shops_schools_hospitals": "10 shops, 2 schools, no hospital"}])
+    assert "People per clinic/hospital: no facility" in engine.facts(no_clinic), engine.facts(no_clinic)
+    print(f"Parsed {len(facility_answers)} facility answers correctly.")
+    peers = [
+        {"village_name_and_state": "A, UP", "population_approx": 5000},
+        {"village_name_and_state": "B, UP", "population_approx": 3000},
+        {"village_name_and_state": "C, UP"},
+        {"village_name_and_state": "D, UP"},
+    ]
+    district_engine = IndicatorEngine(group_by="district")
+    ranked = district_engine.compute(peers)
+    assert "among 2 villages with data in state 'up'" in district_engine.facts(ranked, 0), district_engine.facts(ranked, 0)
+    print("Peer counts and group labels are reported correctly.")
+
+    results = engine.compute(dummy_villages)
+    for i, village in enumerate(dummy_villages):
+        print(f"\n{village['village_name_and_state']}:")
+        print(engine.facts(results, i))
+
+    # Every record in the benchmark batch is distinct, so the parse caches do not help.
+    # Parsing free text costs a few seconds per 100,000 villages; re-ranking is the part
+    # that stays well under a second.
+    import random
+    rng = random.Random(0)
+    states = [f"State {i}" for i in range(30)]
+    tiers = ["3G/4G", "2G", "nahi hai", "fiber broadband", "sirf 2G signal"]
+    problems = ["paani ki kami", "irregular electricity", "poor roads", "no hospital", "unemployment", "drainage"]
+    batch = [
+        {
+            "village_name_and_state": f"Village {i}, {rng.choice(states)}",
+            "population_approx": f"lagbhag {rng.randint(500, 50_000)} log",
+            "internet_availability": f"{rng.choice(tiers)} ({i})",
+            "shops_schools_hospitals": f"{rng.randint(0, 60)} shops, {rng.randint(0, 8)} schools, {rng.randint(0, 3)} clinic, ward {i}",
+            "top_3_problems": f"{', '.join(rng.sample(problems, 3))} (survey {i})",
+        }
+        for i in range(100_000)
+    ]
+    start = time.perf_counter()
+    results = engine.compute(batch)
+    elapsed = time.perf_counter() - start
+    print(f"\nParsed and ranked {len(batch):,} distinct villages in {elapsed:.2f}s.")
+
+    start = time.perf_counter()
+    engine.rank(results)
+    elapsed = time.perf_counter() - start
+    print(f"Re-ranked {len(batch):,} villages in {elapsed:.2f}s.")
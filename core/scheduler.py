@@ -0,0 +1,344 @@
+import heapq
+import itertools
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+# Priority classes, highest priority first.
+PRIORITIES = ("interactive", "normal", "bulk")
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request's deadline passes before it could be dispatched."""
+
+
+class RequestScheduler:
+    """
+    Dispatches model calls from a shared pool of workers by priority class.
+    - Classes are served strictly in order: interactive, normal, bulk.
+    - Within a class, tenants (e.g. districts) are served round-robin for fair share,
+      and each tenant's own requests are served earliest-deadline-first.
+    - Some workers are reserved for interactive requests, so a large batch can never
+      make an interactive user wait behind it.
+    """
+    def __init__(self, max_workers: int = 4, reserved_interactive: int = 1,
+                 urgency_window: float = 2.0, history_size: int = 1000):
+        """
+        Initializes the scheduler and starts its worker threads.
+
+        Args:
+            max_workers: The maximum number of requests running at once.
+            reserved_interactive: Workers that only ever run interactive requests.
+            urgency_window: Seconds before a deadline at which a request jumps the
+                round-robin order of its class.
+            history_size: Number of recent wait times kept per class for metrics.
+        """
+        if not 0 <= reserved_interactive < max_workers:
+            raise ValueError("reserved_interactive must be at least 0 and less than max_workers.")
+        self.max_workers = max_workers
+        self.reserved_interactive = reserved_interactive
+        self.urgency_window = urgency_window
+
+        self._condition = threading.Condition()
+        self._sequence = itertools.count()
+        # Per class: tenant -> heap of (deadline, sequence, request), plus the round-robin order.
+        self._queues = {priority: {} for priority in PRIORITIES}
+        self._tenant_order = {priority: deque() for priority in PRIORITIES}
+        self._shutdown = False
+        self._stats = {
+            priority: {"submitted": 0, "completed": 0, "failed": 0, "expired": 0, "cancelled": 0,
+                       "wait_times": deque(maxlen=history_size)}
+            for priority in PRIORITIES
+        }
+
+        self._workers = []
+        for index in range(max_workers):
+            interactive_only = index < reserved_interactive
+            worker = threading.Thread(target=self._worker_loop, args=(interactive_only,),
+                                      name=f"scheduler-worker-{index}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        # Deadlines are enforced by their own thread, so overdue requests fail on time
+        # even while every worker is busy.
+        self._expiry_thread = threading.Thread(target=self._expiry_loop, name="scheduler-expiry", daemon=True)
+        self._expiry_thread.start()
+
+    def submit(self, func, *args, priority: str = "normal", tenant: str = "default",
+               deadline: float = None, **kwargs) -> Future:
+        """
+        Queues a call and returns a Future for its result.
+
+        Args:
+            func: The callable to run, e.g. a model call.
+            priority: One of "interactive", "normal" or "bulk".
+            tenant: The fair-share key, e.g. a district or state name.
+            deadline: Optional number of seconds from now by which the call must start.
+                Calls still queued after their deadline fail with DeadlineExceeded.
+
+        Returns:
+            A concurrent.futures.Future holding the call's result.
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"priority must be one of {PRIORITIES}, got '{priority}'.")
+        future = Future()
+        now = time.monotonic()
+        request = {
+            "func": func, "args": args, "kwargs": kwargs, "future": future,
+            "priority": priority, "submitted_at": now,
+            "deadline": now + deadline if deadline is not None else math.inf,
+        }
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("Cannot submit to a scheduler that has been shut down.")
+            queues = self._queues[priority]
+            if tenant not in queues:
+                queues[tenant] = []
+                self._tenant_order[priority].append(tenant)
+            heapq.heappush(queues[tenant], (request["deadline"], next(self._sequence), request))
+            self._stats[priority]["submitted"] += 1
+            self._condition.notify_all()
+        return future
+
+    def call(self, func, *args, priority: str = "normal", tenant: str = "default",
+             deadline: float = None, **kwargs):
+        """Submits a call and blocks until its result is available."""
+        return self.submit(func, *args, priority=priority, tenant=tenant,
+                           deadline=deadline, **kwargs).result()
+
+    def metrics(self) -> dict:
+        """
+        Returns queue depth and wait-time metrics per priority class.
+        Wait times are in seconds and cover the most recent dispatched requests.
+        """
+        with self._condition:
+            result = {}
+            for priority in PRIORITIES:
+                stats = self._stats[priority]
+                waits = sorted(stats["wait_times"])
+                result[priority] = {
+                    "queue_depth": sum(len(queue) for queue in self._queues[priority].values()),
+                    "submitted": stats["submitted"],
+                    "completed": stats["completed"],
+                    "failed": stats["failed"],
+                    "expired": stats["expired"],
+                    "cancelled": stats["cancelled"],
+                    "wait_mean": sum(waits) / len(waits) if waits else 0.0,
+                    "wait_p95": waits[min(len(waits) - 1, int(0.95 * len(waits)))] if waits else 0.0,
+                    "wait_max": waits[-1] if waits else 0.0,
+                }
+            return result
+
+    def shutdown(self, wait: bool = True):
+        """Stops accepting requests, fails anything still queued, and stops the workers."""
+        with self._condition:
+            self._shutdown = True
+            for priority in PRIORITIES:
+                for queue in self._queues[priority].values():
+                    for _, _, request in queue:
+                        if not self._fail(request, RuntimeError("Scheduler was shut down.")):
+                            self._stats[priority]["cancelled"] += 1
+                    queue.clear()
+                self._queues[priority].clear()
+                self._tenant_order[priority].clear()
+            self._condition.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+            self._expiry_thread.join()
+
+    def _worker_loop(self, interactive_only: bool):
+        """Takes the next eligible request, runs it, and records the outcome."""
+        while True:
+            with self._condition:
+                request = self._next_request(interactive_only)
+                while request is None and not self._shutdown:
+                    self._condition.wait()
+                    request = self._next_request(interactive_only)
+                if request is None:
+                    return
+
+            future = request["future"]
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(request["func"](*request["args"], **request["kwargs"]))
+                    outcome = "completed"
+                except Exception as e:
+                    future.set_exception(e)
+                    outcome = "failed"
+            else:
+                outcome = "cancelled"
+
+            with self._condition:
+                self._stats[request["priority"]][outcome] += 1
+
+    def _expiry_loop(self):
+        """Fails overdue requests in every class, sleeping until the next queued deadline."""
+        with self._condition:
+            while not self._shutdown:
+                now = time.monotonic()
+                for priority in PRIORITIES:
+                    self._expire_overdue(priority, now)
+                self._condition.wait(timeout=self._wait_timeout())
+
+    def _next_request(self, interactive_only: bool):
+        """Pops the next request this worker may run. Caller holds the lock."""
+        now = time.monotonic()
+        for priority in PRIORITIES:
+            if interactive_only and priority != "interactive":
+                break
+            request = self._pop_from_class(priority, now)
+            if request is not None:
+                self._stats[priority]["wait_times"].append(now - request["submitted_at"])
+                return request
+        return None
+
+    def _pop_from_class(self, priority: str, now: float):
+        """Picks a tenant round-robin (urgent deadlines first) and pops its earliest-deadline request."""
+        queues = self._queues[priority]
+        order = self._tenant_order[priority]
+        self._expire_overdue(priority, now)
+        if not order:
+            return None
+
+        urgent = [tenant for tenant in order if queues[tenant][0][0] - now <= self.urgency_window]
+        if urgent:
+            tenant = min(urgent, key=lambda t: queues[t][0][0])
+            order.remove(tenant)
+        else:
+            tenant = order.popleft()
+
+        _, _, request = heapq.heappop(queues[tenant])
+        if queues[tenant]:
+            order.append(tenant)
+        else:
+            del queues[tenant]
+        return request
+
+    def _expire_overdue(self, priority: str, now: float):
+        """Fails queued requests whose deadline has already passed."""
+        queues = self._queues[priority]
+        for tenant in list(self._tenant_order[priority]):
+            queue = queues[tenant]
+            while queue and queue[0][0] < now:
+                _, _, request = heapq.heappop(queue)
+                expired = self._fail(request, DeadlineExceeded(
+                    f"{priority} request for '{tenant}' waited {now - request['submitted_at']:.2f}s "
+                    f"and missed its deadline."
+                ))
+                self._stats[priority]["expired" if expired else "cancelled"] += 1
+            if not queue:
+                del queues[tenant]
+                self._tenant_order[priority].remove(tenant)
+
+    @staticmethod
+    def _fail(request: dict, error: Exception) -> bool:
+        """Fails a queued request's future. Returns False if the caller had already cancelled it."""
+        if request["future"].set_running_or_notify_cancel():
+            request["future"].set_exception(error)
+            return True
+        return False
+
+    def _wait_timeout(self):
+        """Returns how long the expiry thread may sleep before the next queued deadline passes."""
+        deadlines = [queue[0][0] for priority in PRIORITIES for queue in self._queues[priority].values()]
+        finite = [d for d in deadlines if d != math.inf]
+        if not finite:
+            return None
+        return max(0.0, min(finite) - time.monotonic()) + 0.001
+
+
+if __name__ == '__main__':
+    # This is a test harness for the RequestScheduler using a fake backend. No API key is needed.
+    # Each check asserts, so a broken guarantee fails the run.
+    import random
+
+    LATENCY = 0.03
+    EPSILON = 0.02
+
+    def fake_backend(prompt: str, latency: float) -> str:
+        """Stands in for the Gemini API with an injected latency."""
+        time.sleep(latency)
+        return f"Fake response to: {prompt}"
+
+    def blocked_scheduler():
+        """Returns a scheduler with one shared worker, held busy until the returned event is set."""
+        blocked = RequestScheduler(max_workers=2, reserved_interactive=1)
+        release = threading.Event()
+        blocked.submit(release.wait, priority="bulk", tenant="blocker")
+        time.sleep(0.05)
+        return blocked, release
+
+    print("--- Running RequestScheduler Test ---")
+
+    # 1. An interactive session is not slowed down by a large batch run across several districts.
+    scheduler = RequestScheduler(max_workers=4, reserved_interactive=1)
+    bulk_futures = [
+        scheduler.submit(fake_backend, f"Analyze village {i}", random.uniform(0.02, 0.05),
+                         priority="bulk", tenant=f"District-{i % 5}")
+        for i in range(200)
+    ]
+    time.sleep(0.1)
+    interactive_latencies = []
+    for i in range(5):
+        start = time.monotonic()
+        scheduler.call(fake_backend, f"Clarify answer {i}", LATENCY, priority="interactive", tenant="User")
+        interactive_latencies.append(time.monotonic() - start)
+    for future in bulk_futures:
+        future.result()
+    assert max(interactive_latencies) < LATENCY + EPSILON, f"Interactive latencies too high: {interactive_latencies}"
+    print(f"Interactive round-trip latencies: {', '.join(f'{t:.3f}s' for t in interactive_latencies)}")
+
+    metrics = scheduler.metrics()
+    assert metrics["bulk"]["completed"] == 200 and metrics["bulk"]["submitted"] == 200, metrics["bulk"]
+    assert metrics["interactive"]["completed"] == 5, metrics["interactive"]
+    assert all(stats["queue_depth"] == 0 for stats in metrics.values()), metrics
+    for priority, stats in metrics.items():
+        print(f"{priority:>11}: depth={stats['queue_depth']} completed={stats['completed']} "
+              f"expired={stats['expired']} wait_mean={stats['wait_mean']:.3f}s "
+              f"wait_p95={stats['wait_p95']:.3f}s wait_max={stats['wait_max']:.3f}s")
+    scheduler.shutdown()
+
+    # 2. Tenants within a class are served round-robin.
+    scheduler, release = blocked_scheduler()
+    order = []
+    fair_futures = [
+        scheduler.submit(order.append, name, priority="bulk", tenant=name[0])
+        for name in ["A1", "A2", "A3", "A4", "B1", "B2"]
+    ]
+    release.set()
+    for future in fair_futures:
+        future.result()
+    assert order == ["A1", "B1", "A2", "B2", "A3", "A4"], f"Unfair dispatch order: {order}"
+    print(f"Fair-share dispatch order: {order}")
+    scheduler.shutdown()
+
+    # 3. Requests that miss their deadline fail promptly, even while every shared worker is busy.
+    scheduler, release = blocked_scheduler()
+    failed_at = {}
+    submitted_at = time.monotonic()
+    deadline_futures = [
+        scheduler.submit(fake_backend, f"Report {i}", 0.0, priority="bulk", tenant="Reports", deadline=0.01)
+        for i in range(2)
+    ]
+    for i, future in enumerate(deadline_futures):
+        future.add_done_callback(lambda _, i=i: failed_at.setdefault(i, time.monotonic()))
+    patient_future = scheduler.submit(fake_backend, "Report without deadline", 0.0, priority="bulk", tenant="Reports")
+    cancelled_future = scheduler.submit(fake_backend, "Report nobody wants", 0.0, priority="bulk", tenant="Reports")
+    assert cancelled_future.cancel()
+    for future in deadline_futures:
+        assert isinstance(future.exception(timeout=1), DeadlineExceeded), "Expected DeadlineExceeded"
+    slowest = max(failed_at.values()) - submitted_at
+    assert slowest < 0.01 + EPSILON, f"DeadlineExceeded fired {slowest:.3f}s after submit"
+    release.set()
+    patient_future.result(timeout=1)
+    time.sleep(0.05)
+
+    metrics = scheduler.metrics()["bulk"]
+    assert metrics["expired"] == 2 and metrics["cancelled"] == 1 and metrics["failed"] == 0, metrics
+    print(f"Short-deadline requests failed {slowest:.3f}s after submit; "
+          f"expired={metrics['expired']} cancelled={metrics['cancelled']} failed={metrics['failed']}")
+    scheduler.shutdown()
+
+    print("All scheduler checks passed.")
@@ -1,18 +1,34 @@
 import os
-from core.gemini_client import GeminiClient
+import argparse
+from core.gemini_client import GeminiClient, is_generation_error
+from core.checkpoint import RunCheckpoint, StageFailed
 from agents.input_agent import InputAgent
 from agents.analysis_agent import AnalysisAgent
 from agents.planning_agent import PlanningAgent
 from reporting.report_builder import ReportBuilder
 from reporting.pdf_generator import PDFGenerator
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Village Digital Twin AI Agent")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                        help="Resume a failed run, skipping the stages it already completed.")
+    return parser.parse_args()
+
 def main():
     """
     The main function to run the Village Digital Twin AI Agent.
     """
+    args = parse_args()
+    try:
+        checkpoint = RunCheckpoint(args.resume, is_failure=is_generation_error)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Could not resume: {e}")
+        return
+
     try:
         # 1. Initialization
         print("--- Village Digital Twin AI Agent Initializing ---")
+        print(f"Run ID: {checkpoint.run_id}")
         gemini_client = GeminiClient()
         
         # Initialize Agents
@@ -21,18 +37,25 @@ def main():
         planning_agent = PlanningAgent(gemini_client)
         
         # --- Main Workflow ---
+        # Each completed stage is checkpointed, so a resumed run skips it. A failed stage
+        # stops the run, so no later stage is built on (or saved from) its output.
         
         # 2. Data Gathering
-        village_data = input_agent.gather_data()
+        village_data = checkpoint.run_stage("village_data", input_agent.gather_data)
         if not village_data:
             print("Could not gather village data. Exiting.")
             return
 
+        # Analysis and planning calls share one scheduler tenant, the village's peer group.
+        tenant = analysis_agent.indicator_engine.peer_group(village_data)
+
         # 3. Analysis
-        analysis_results = analysis_agent.analyze(village_data)
+        analysis_results = checkpoint.run_stage("analysis_results", analysis_agent.analyze,
+                                                village_data, checkpoint=checkpoint, tenant=tenant)
 
         # 4. Planning
-        growth_plan = planning_agent.create_growth_plan(village_data, analysis_results)
+        growth_plan = checkpoint.run_stage("growth_plan", planning_agent.create_growth_plan,
+                                           village_data, analysis_results, tenant=tenant)
 
         # 5. Report Generation
         print("\n--- Final Report Generation ---")
@@ -78,8 +101,15 @@ def main():
             else:
                 print("Aमान्य vikalp. Kripya 'JSON', 'PDF', ya 'No' me se chunein. (Invalid option. Please choose 'JSON', 'PDF', or 'No'.)")
 
+    except StageFailed as e:
+        print(f"\n{e} Gemini se jawab nahi mila. (No response from Gemini.)")
+        if checkpoint.has_saved_stages():
+            print(f"Completed stages are saved. Resume with: python main.py --resume {checkpoint.run_id}")
+        print("The program will now exit.")
     except Exception as e:
         print(f"\nAn unexpected error occurred: {e}")
+        if checkpoint.has_saved_stages():
+            print(f"Completed stages are saved. Resume with: python main.py --resume {checkpoint.run_id}")
         print("The program will now exit.")
 
 if __name__ == '__main__':
@@ -33,6 +33,7 @@ Report Generated on: {self.report_date}
 ==================================================
 {self.analysis_results.get('village_profile', 'No profile available.')}
 
+{get_analysis('key_indicators', 'Key Indicators')}
 ==================================================
 **2. Key Challenges & Opportunities**
 ==================================================